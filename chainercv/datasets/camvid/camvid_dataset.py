@@ -48,7 +48,10 @@ camvid_ignore_label_color = (0, 0, 0)
 def get_camvid():
     data_root = download.get_dataset_directory(root)
     download_file_path = utils.cached_download(url)
-    if len(glob.glob(os.path.join(data_root, '*'))) != 9:
+    # Exclude the arrays cached by CamVidDataset.
+    fns = [fn for fn in glob.glob(os.path.join(data_root, '*'))
+           if not fn.endswith(('.npy', '.tmp'))]
+    if len(fns) != 9:
         utils.extractall(
             download_file_path, data_root, os.path.splitext(url)[1])
     data_dir = os.path.join(data_root, 'SegNet-Tutorial-master/CamVid')
@@ -59,12 +62,77 @@ def get_camvid():
     return data_root
 
 
+# Parsed image lists keyed by (data_dir, split).
+_paths_cache = dict()
+
+
+def _get_paths(data_dir, split):
+    key = (data_dir, split)
+    if key not in _paths_cache:
+        img_list_path = os.path.join(data_dir, '{}.txt'.format(split))
+        _paths_cache[key] = [
+            [os.path.join(data_dir, fn.replace('/SegNet/CamVid/', ''))
+             for fn in line.split()] for line in open(img_list_path)]
+    return _paths_cache[key]
+
+
+def _load_camvid_cache(data_dir, split, paths):
+    # Images and labels are decoded only once and stored as a memory-mapped
+    # array, so that get_example does not decode files every epoch.
+    # Each record holds an image and its label next to each other, so that
+    # an example is read from a single contiguous region of the file.
+    cache = os.path.join(data_dir, '{}.npy'.format(split))
+    if not os.path.exists(cache):
+        if not os.access(data_dir, os.W_OK):
+            # Examples are decoded from the files on each access.
+            return None, None
+        # The temporary file is unique to this process, so that processes
+        # building the same cache concurrently do not truncate each other.
+        tmp = '{}.{}.tmp'.format(cache, os.getpid())
+        _, H, W = read_image(paths[0][0], dtype=np.uint8).shape
+        dtype = np.dtype([
+            ('img', np.uint8, (3, H, W)), ('label', np.uint8, (H, W))])
+        examples = np.lib.format.open_memmap(
+            tmp, mode='w+', dtype=dtype, shape=(len(paths),))
+        try:
+            for i, (img_path, label_path) in enumerate(paths):
+                img = read_image(img_path, dtype=np.uint8, color=True)
+                label = read_image(
+                    label_path, dtype=np.uint8, color=False)[0]
+                if not img.shape[1:] == label.shape == (H, W):
+                    raise ValueError(
+                        'All images and labels in a split must have '
+                        'the same size. {} and {} do not have size {}.'
+                        .format(img_path, label_path, (H, W)))
+                examples['img'][i] = img
+                examples['label'][i] = label
+            # Write the data to the disk before making it visible under
+            # the final name.
+            examples.flush()
+        except Exception:
+            del examples
+            os.remove(tmp)
+            raise
+        del examples
+        os.rename(tmp, cache)
+    examples = np.load(cache, mmap_mode='r')
+    return examples['img'], examples['label']
+
+
 class CamVidDataset(chainer.dataset.DatasetMixin):
 
     """Semantic segmentation dataset for CamVid `u`_.
 
     .. _`u`: https://github.com/alexgkendall/SegNet-Tutorial/tree/master/CamVid
 
+    On the first access to a split, all of its images and labels are decoded
+    and stored under :obj:`data_dir` as :obj:`{split}.npy`, in which each
+    image is followed by its label. Later accesses read examples from this
+    array through a memory map. All images and labels in a split need to
+    have the same size. If :obj:`data_dir` is not writable and the array
+    does not exist yet, examples are decoded from the image files on each
+    access instead.
+
     Args:
         data_dir (string): Path to the root of the training data. If this is
             :obj:`auto`, this class will automatically download data for you
@@ -82,10 +150,9 @@ class CamVidDataset(chainer.dataset.DatasetMixin):
         if data_dir == 'auto':
             data_dir = get_camvid()
 
-        img_list_path = os.path.join(data_dir, '{}.txt'.format(split))
-        self.paths = [
-            [os.path.join(data_dir, fn.replace('/SegNet/CamVid/', ''))
-             for fn in line.split()] for line in open(img_list_path)]
+        self.paths = _get_paths(data_dir, split)
+        self.imgs, self.labels = _load_camvid_cache(
+            data_dir, split, self.paths)
 
     def __len__(self):
         return len(self.paths)
@@ -108,9 +175,13 @@ class CamVidDataset(chainer.dataset.DatasetMixin):
         """
         if i >= len(self):
             raise IndexError('index is too large')
-        img_path, label_path = self.paths[i]
-        img = read_image(img_path, color=True)
-        label = read_image(label_path, dtype=np.int32, color=False)[0]
+        if self.imgs is None:
+            img_path, label_path = self.paths[i]
+            img = read_image(img_path, color=True)
+            label = read_image(label_path, dtype=np.int32, color=False)[0]
+        else:
+            img = self.imgs[i].astype(np.float32)
+            label = self.labels[i].astype(np.int32)
         # Label id 11 is for unlabeled pixels.
         label[label == 11] = -1
         return img, label
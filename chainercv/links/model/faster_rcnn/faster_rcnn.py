@@ -71,10 +71,16 @@ class FasterRCNN(chainer.Chain):
             :class:`chainercv.links.RegionProposalNetwork`. Please refer to
             the documentation found there.
         head (callable Chain): A callable that takes
-            a BCHW array, RoIs and batch indices for RoIs. This returns class
-            dependent localization paramters and class scores.
+            a BCHW array and an array that concatenates batch indices and
+            RoIs. Its shape is :math:`(R', 5)` and each row is organized by
+            :obj:`(batch_index, x_min, y_min, x_max, y_max)`, which is
+            the order expected by :func:`chainer.functions.roi_pooling_2d`.
+            This returns class dependent localization paramters and
+            class scores.
         mean (numpy.ndarray): A value to be subtracted from an image
-            in :meth:`prepare`.
+            in :meth:`__call__`. This is a value for each channel and
+            its shape is :math:`(C, 1, 1)`. This is moved to the device
+            of the model together with its parameters.
         min_size (int): A preprocessing paramter for :meth:`prepare`. Please
             refer to a docstring found for :meth:`prepare`.
         max_size (int): A preprocessing paramter for :meth:`prepare`.
@@ -99,7 +105,15 @@ class FasterRCNN(chainer.Chain):
             self.rpn = rpn
             self.head = head
 
+        mean = np.asarray(mean, dtype=np.float32)
+        if not (mean.ndim == 3 and mean.shape[1:] == (1, 1)):
+            raise ValueError(
+                'The shape of mean should be (C, 1, 1), but {} is given.'
+                .format(mean.shape))
         self.mean = mean
+        # The negated mean is kept as a bias for each channel,
+        # so that no array is allocated to subtract it on each forward.
+        self._mean_bias = -mean.ravel()
         self.min_size = min_size
         self.max_size = max_size
         self.loc_normalize_mean = loc_normalize_mean
@@ -107,6 +121,18 @@ class FasterRCNN(chainer.Chain):
 
         self.use_preset('visualize')
 
+    def to_cpu(self):
+        super(FasterRCNN, self).to_cpu()
+        self.mean = cuda.to_cpu(self.mean)
+        self._mean_bias = cuda.to_cpu(self._mean_bias)
+        return self
+
+    def to_gpu(self, device=None):
+        super(FasterRCNN, self).to_gpu(device)
+        self.mean = cuda.to_gpu(self.mean, device)
+        self._mean_bias = cuda.to_gpu(self._mean_bias, device)
+        return self
+
     @property
     def n_class(self):
         # Total number of classes including the background.
@@ -131,7 +157,9 @@ class FasterRCNN(chainer.Chain):
         the :math:`L` th class.
 
         Args:
-            x (~chainer.Variable): 4D image variable.
+            x (~chainer.Variable): 4D image variable. The images are
+                resized by :meth:`prepare`. The mean value :obj:`self.mean`
+                is subtracted by this method.
             scale (float): Amount of scaling applied to the raw image
                 during preprocessing.
 
@@ -151,13 +179,18 @@ class FasterRCNN(chainer.Chain):
         """
         img_size = x.shape[2:]
 
+        x = self._subtract_mean(x)
         h = self.extractor(x)
         rpn_locs, rpn_scores, rois, roi_indices, anchor =\
             self.rpn(h, img_size, scale)
-        roi_cls_locs, roi_scores = self.head(
-            h, rois, roi_indices)
+        indices_and_rois = _make_indices_and_rois(rois, roi_indices)
+        roi_cls_locs, roi_scores = self.head(h, indices_and_rois)
         return roi_cls_locs, roi_scores, rois, roi_indices
 
+    def _subtract_mean(self, x):
+        # The mean is subtracted on the device of the model.
+        return F.bias(x, self._mean_bias, axis=1)
+
     def use_preset(self, preset):
         """Use the given preset during prediction.
 
@@ -193,8 +226,8 @@ class FasterRCNN(chainer.Chain):
         :obj:`self.max_size`, the image is scaled to fit the longer edge
         to :obj:`self.max_size`.
 
-        After resizing the image, the image is subtracted by a mean image value
-        :obj:`self.mean`.
+        The mean value :obj:`self.mean` is not subtracted here.
+        It is subtracted by :meth:`__call__` on the device of the model.
 
         Args:
             img (~numpy.ndarray): An image. This is in CHW and RGB format.
@@ -215,9 +248,7 @@ class FasterRCNN(chainer.Chain):
             scale = self.max_size / max(H, W)
 
         img = resize(img, (int(H * scale), int(W * scale)))
-
-        img = (img - self.mean).astype(np.float32, copy=False)
-        return img
+        return img.astype(np.float32, copy=False)
 
     def _suppress(self, raw_cls_bbox, raw_prob):
         bbox = list()
@@ -319,3 +350,16 @@ class FasterRCNN(chainer.Chain):
             scores.append(score)
 
         return bboxes, labels, scores
+
+
+def _make_indices_and_rois(rois, roi_indices):
+    # The batch indices and RoIs are written to a single array
+    # instead of casting the indices and concatenating the two arrays.
+    # The coordinates are converted from (y, x) to (x, y) order
+    # with strided copies.
+    xp = cuda.get_array_module(rois)
+    indices_and_rois = xp.empty((len(rois), 5), dtype=np.float32)
+    indices_and_rois[:, 0] = roi_indices
+    indices_and_rois[:, 1::2] = rois[:, 1::2]
+    indices_and_rois[:, 2::2] = rois[:, 0::2]
+    return indices_and_rois
@@ -4,6 +4,8 @@ import chainer
 from chainer import cuda
 import chainer.functions as F
 
+from chainercv.links.model.faster_rcnn.faster_rcnn import \
+    _make_indices_and_rois
 from chainercv.links.model.faster_rcnn.utils.anchor_target_creator import\
     AnchorTargetCreator
 from chainercv.links.model.faster_rcnn.utils.proposal_target_creator import\
@@ -103,6 +105,8 @@ class FasterRCNNTrainChain(chainer.Chain):
         _, _, H, W = imgs.shape
         img_size = (H, W)
 
+        # This is the same as FasterRCNN.__call__.
+        imgs = self.faster_rcnn._subtract_mean(imgs)
         features = self.faster_rcnn.extractor(imgs)
         rpn_locs, rpn_scores, rois, roi_indices, anchor = self.faster_rcnn.rpn(
             features, img_size, scale)
@@ -118,9 +122,10 @@ class FasterRCNNTrainChain(chainer.Chain):
         sample_roi, gt_roi_loc, gt_roi_label = self.proposal_target_creator(
             roi, bbox, label,
             self.loc_normalize_mean, self.loc_normalize_std)
-        sample_roi_index = self.xp.zeros((len(sample_roi),), dtype=np.int32)
+        # Since batch size is one, all batch indices are zero.
+        sample_indices_and_roi = _make_indices_and_rois(sample_roi, 0)
         roi_cls_loc, roi_score = self.faster_rcnn.head(
-            features, sample_roi, sample_roi_index)
+            features, sample_indices_and_roi)
 
         # RPN losses
         gt_rpn_loc, gt_rpn_label = self.anchor_target_creator(
@@ -1,6 +1,7 @@
 import numpy as np
 
 import chainer
+from chainer import cuda
 import chainer.functions as F
 import chainer.links as L
 
@@ -147,22 +148,15 @@ class FasterRCNNVGG16(FasterRCNN):
             chainer.serializers.load_npz(pretrained_model, self)
 
     def _copy_imagenet_pretrained_vgg16(self):
-        pretrained_model = VGG16(pretrained_model='imagenet')
-        self.extractor.conv1_1.copyparams(pretrained_model.conv1_1)
-        self.extractor.conv1_2.copyparams(pretrained_model.conv1_2)
-        self.extractor.conv2_1.copyparams(pretrained_model.conv2_1)
-        self.extractor.conv2_2.copyparams(pretrained_model.conv2_2)
-        self.extractor.conv3_1.copyparams(pretrained_model.conv3_1)
-        self.extractor.conv3_2.copyparams(pretrained_model.conv3_2)
-        self.extractor.conv3_3.copyparams(pretrained_model.conv3_3)
-        self.extractor.conv4_1.copyparams(pretrained_model.conv4_1)
-        self.extractor.conv4_2.copyparams(pretrained_model.conv4_2)
-        self.extractor.conv4_3.copyparams(pretrained_model.conv4_3)
-        self.extractor.conv5_1.copyparams(pretrained_model.conv5_1)
-        self.extractor.conv5_2.copyparams(pretrained_model.conv5_2)
-        self.extractor.conv5_3.copyparams(pretrained_model.conv5_3)
-        self.head.fc6.copyparams(pretrained_model.fc6)
-        self.head.fc7.copyparams(pretrained_model.fc7)
+        # The weights are read directly from the file of VGG16, instead of
+        # building VGG16 with its classifier and copying from it.
+        # NpzDeserializer only reads the arrays needed by the given links.
+        path = download_model(VGG16._models['imagenet']['url'])
+        with np.load(path) as f:
+            deserializer = chainer.serializers.NpzDeserializer(f)
+            deserializer.load(self.extractor)
+            deserializer['fc6'].load(self.head.fc6)
+            deserializer['fc7'].load(self.head.fc7)
 
 
 class VGG16RoIHead(chainer.Chain):
@@ -198,27 +192,23 @@ class VGG16RoIHead(chainer.Chain):
         self.roi_size = roi_size
         self.spatial_scale = spatial_scale
 
-    def __call__(self, x, rois, roi_indices):
+    def __call__(self, x, indices_and_rois):
         """Forward the chain.
 
         We assume that there are :math:`N` batches.
 
         Args:
             x (~chainer.Variable): 4D image variable.
-            rois (array): A bounding box array containing coordinates of
-                proposal boxes.  This is a concatenation of bounding box
-                arrays from multiple images in the batch.
-                Its shape is :math:`(R', 4)`. Given :math:`R_i` proposed
-                RoIs from the :math:`i` th image,
-                :math:`R' = \\sum _{i=1} ^ N R_i`.
-            roi_indices (array): An array containing indices of images to
-                which bounding boxes correspond to. Its shape is :math:`(R',)`.
+            indices_and_rois (array): An array containing indices of images
+                and coordinates of proposal boxes. This is a concatenation of
+                RoIs from multiple images in the batch. Its shape is
+                :math:`(R', 5)`. Given :math:`R_i` proposed RoIs from
+                the :math:`i` th image, :math:`R' = \\sum _{i=1} ^ N R_i`.
+                Each row is organized by
+                :obj:`(batch_index, x_min, y_min, x_max, y_max)`.
 
         """
-        roi_indices = roi_indices.astype(np.float32)
-        indices_and_rois = self.xp.concatenate(
-            (roi_indices[:, None], rois), axis=1)
-        pool = _roi_pooling_2d_yx(
+        pool = F.roi_pooling_2d(
             x, indices_and_rois, self.roi_size, self.roi_size,
             self.spatial_scale)
 
@@ -228,9 +218,53 @@ class VGG16RoIHead(chainer.Chain):
         roi_scores = self.score(fc7)
         return roi_cls_locs, roi_scores
 
+    def compress(self, fc6_rank=1024, fc7_rank=256):
+        """Compress the fully connected layers with truncated SVD.
 
-def _roi_pooling_2d_yx(x, indices_and_rois, outh, outw, spatial_scale):
-    xy_indices_and_rois = indices_and_rois[:, [0, 2, 1, 4, 3]]
-    pool = F.roi_pooling_2d(
-        x, xy_indices_and_rois, outh, outw, spatial_scale)
-    return pool
+        This method replaces :obj:`fc6` and :obj:`fc7` with pairs of
+        smaller fully connected layers that approximate them by
+        the truncated singular value decomposition of their weights [#]_.
+        Since these layers are applied to every RoI, this reduces
+        computation and memory traffic of the head during inference.
+        The default ranks are the values used in the reference.
+
+        Please call this method after loading weights, because
+        the names of the parameters change.
+
+        .. [#] Ross Girshick. Fast R-CNN. ICCV 2015.
+
+        Args:
+            fc6_rank (int): The number of singular values kept for
+                :obj:`fc6`.
+            fc7_rank (int): The number of singular values kept for
+                :obj:`fc7`.
+
+        """
+        for name, rank in (('fc6', fc6_rank), ('fc7', fc7_rank)):
+            fc = getattr(self, name)
+            delattr(self, name)
+            with self.init_scope():
+                setattr(self, name, _TruncatedSVDLinear(fc, rank))
+
+
+class _TruncatedSVDLinear(chainer.Chain):
+
+    def __init__(self, fc, rank):
+        super(_TruncatedSVDLinear, self).__init__()
+        W = cuda.to_cpu(fc.W.data)
+        b = cuda.to_cpu(fc.b.data)
+        U, s, V = np.linalg.svd(W, full_matrices=False)
+        # W is approximated by U[:, :rank] * s[:rank] * V[:rank].
+        with self.init_scope():
+            self.v = L.Linear(
+                W.shape[1], rank, nobias=True,
+                initialW=(s[:rank, None] * V[:rank]).astype(np.float32))
+            self.u = L.Linear(
+                rank, W.shape[0],
+                initialW=U[:, :rank].astype(np.float32), initial_bias=b)
+
+        if fc.xp is not np:
+            self.to_gpu(cuda.get_device_from_array(fc.W.data))
+
+    def __call__(self, x):
+        return self.u(self.v(x))
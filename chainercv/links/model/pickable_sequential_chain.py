@@ -137,15 +137,16 @@ class PickableSequentialChain(chainer.Chain):
         # in pick.
         last_index = max(self.layer_names.index(name) for name in pick)
 
-        layers = dict()
         h = x
+        if not self._return_tuple:
+            # The only picked layer is the last layer to be computed.
+            for name in self.layer_names[:last_index + 1]:
+                h = self[name](h)
+            return h
+
+        layers = dict()
         for name in self.layer_names[:last_index + 1]:
             h = self[name](h)
             if name in pick:
                 layers[name] = h
-
-        if self._return_tuple:
-            layers = tuple(layers[name] for name in pick)
-        else:
-            layers = list(layers.values())[0]
-        return layers
+        return tuple(layers[name] for name in pick)
@@ -1,26 +1,31 @@
 import numpy as np
+import os
 from PIL import Image
 
 
-def read_image(path, dtype=np.float32, color=True):
-    """Read an image from a file.
+try:
+    import cv2
 
-    This function reads an image from given file. The image is CHW format and
-    the range of its value is :math:`[0, 255]`. If :obj:`color = True`, the
-    order of the channels is RGB.
+    # The orientation in EXIF is ignored as in PIL. OpenCV older than 3.1
+    # does not define this flag and ignores the orientation anyway.
+    _cv2_read_flags = cv2.IMREAD_COLOR | \
+        getattr(cv2, 'IMREAD_IGNORE_ORIENTATION', 0)
 
-    Args:
-        path (str): A path of image file.
-        dtype: The type of array. The default value is :obj:`~numpy.float32`.
-        color (bool): This option determines the number of channels.
-            If :obj:`True`, the number of channels is three. In this case,
-            the order of the channels is RGB. This is the default behaviour.
-            If :obj:`False`, this function returns a grayscale image.
+    def _read_image_cv2(path, dtype):
+        img = cv2.imread(path, _cv2_read_flags)
+        if img is None:
+            raise IOError('cv2 failed to read {}'.format(path))
+        # BGR -> RGB and (H, W, C) -> (C, H, W) are applied as views.
+        # The only copy happens in astype.
+        return img[:, :, ::-1].transpose((2, 0, 1)).astype(dtype)
 
-    Returns:
-        ~numpy.ndarray: An image.
-    """
+    _cv2_available = True
 
+except ImportError:
+    _cv2_available = False
+
+
+def _read_image_pil(path, dtype, color):
     f = Image.open(path)
     try:
         if color:
@@ -38,3 +43,37 @@ def read_image(path, dtype=np.float32, color=True):
     else:
         # transpose (H, W, C) -> (C, H, W)
         return img.transpose((2, 0, 1))
+
+
+def read_image(path, dtype=np.float32, color=True):
+    """Read an image from a file.
+
+    This function reads an image from given file. The image is CHW format and
+    the range of its value is :math:`[0, 255]`. If :obj:`color = True`, the
+    order of the channels is RGB.
+
+    By default, images are decoded by :mod:`PIL`. Decoding can be
+    accelerated by installing Pillow-SIMD, which is a drop-in replacement
+    of Pillow. Alternatively, color images are decoded by :mod:`cv2`
+    when the environment variable :obj:`CHAINERCV_IMAGE_BACKEND` is set to
+    :obj:`opencv` and :mod:`cv2` is installed. Recent versions of
+    :mod:`cv2` decode JPEG files with libjpeg-turbo.
+    Grayscale images are always decoded by :mod:`PIL` because :mod:`cv2`
+    does not preserve indices of palette images.
+
+    Args:
+        path (str): A path of image file.
+        dtype: The type of array. The default value is :obj:`~numpy.float32`.
+        color (bool): This option determines the number of channels.
+            If :obj:`True`, the number of channels is three. In this case,
+            the order of the channels is RGB. This is the default behaviour.
+            If :obj:`False`, this function returns a grayscale image.
+
+    Returns:
+        ~numpy.ndarray: An image.
+    """
+
+    if color and _cv2_available and \
+            os.environ.get('CHAINERCV_IMAGE_BACKEND') == 'opencv':
+        return _read_image_cv2(path, dtype)
+    return _read_image_pil(path, dtype, color)
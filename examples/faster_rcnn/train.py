@@ -1,9 +1,14 @@
 from __future__ import division
 
 import argparse
+import multiprocessing
 import numpy as np
+import os
+import random
 
 import chainer
+from chainer import cuda
+from chainer.dataset import concat_examples
 from chainer.datasets import TransformDataset
 from chainer import training
 from chainer.training import extensions
@@ -16,34 +21,81 @@ from chainercv.links import FasterRCNNVGG16
 from chainercv.links.model.faster_rcnn import FasterRCNNTrainChain
 from chainercv import transforms
 
+try:
+    import cv2
+    _cv2_available = True
+except ImportError:
+    _cv2_available = False
+
 
 class ConcatenatedDataset(chainer.dataset.DatasetMixin):
 
     def __init__(self, *datasets):
-        self._datasets = datasets
+        self._datasets = tuple(datasets)
+        # The k-th element is the index where the k-th dataset starts.
+        # The last element is the total length, which is 0 without datasets.
+        self._offsets = np.cumsum(
+            [0] + [len(dataset) for dataset in datasets], dtype=np.int64)
 
     def __len__(self):
-        return sum(len(dataset) for dataset in self._datasets)
+        return int(self._offsets[-1])
 
     def get_example(self, i):
-        if i < 0:
+        if i < 0 or i >= self._offsets[-1]:
             raise IndexError
-        for dataset in self._datasets:
-            if i < len(dataset):
-                return dataset[i]
-            i -= len(dataset)
-        raise IndexError
+        k = int(np.searchsorted(self._offsets, i, side='right')) - 1
+        return self._datasets[k][i - int(self._offsets[k])]
+
+
+def _resize_to_uint8(img, size):
+    if _cv2_available:
+        # Convert to HWC uint8 in a single pass, so that cv2 resizes
+        # the image without splitting channels or casting to float.
+        H, W = size
+        img = np.ascontiguousarray(img.transpose((1, 2, 0)), dtype=np.uint8)
+        img = cv2.resize(img, (W, H), interpolation=cv2.INTER_LINEAR)
+        return img.transpose((2, 0, 1))
+    img = transforms.resize(img, size)
+    return np.round(img).astype(np.uint8)
 
 
 class Transform(object):
 
-    def __init__(self, faster_rcnn):
-        self.faster_rcnn = faster_rcnn
+    # Only the preprocessing parameters of FasterRCNN are kept, so that
+    # the dataset does not hold a reference to the model.
+
+    def __init__(self, min_size, max_size, seed):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.seed = seed
+        self._pid = None
+
+    def _reseed(self):
+        # Worker processes of MultiprocessIterator are forked with
+        # the random states of the parent process. Without reseeding,
+        # the workers draw the same sequence of flips.
+        # The pid only detects a new process. The seed is derived from
+        # the index of the pool worker, which is 0 in the main process,
+        # so that the flips are determined by the seed.
+        pid = os.getpid()
+        if self._pid != pid:
+            identity = multiprocessing.current_process()._identity
+            worker_id = identity[0] if identity else 0
+            seed = (self.seed + worker_id) % 2 ** 32
+            random.seed(seed)
+            np.random.seed(seed)
+            self._pid = pid
 
     def __call__(self, in_data):
+        self._reseed()
         img, bbox, label = in_data
         _, H, W = img.shape
-        img = self.faster_rcnn.prepare(img)
+        # Same resizing as FasterRCNN.prepare. Images are sent as uint8
+        # and cast to float32 by Converter on the device.
+        scale = self.min_size / min(H, W)
+        if scale * max(H, W) > self.max_size:
+            scale = self.max_size / max(H, W)
+        img = _resize_to_uint8(img, (int(H * scale), int(W * scale)))
         _, o_H, o_W = img.shape
         scale = o_H / H
         bbox = transforms.resize_bbox(bbox, (H, W), (o_H, o_W))
@@ -57,6 +109,172 @@ class Transform(object):
         return img, bbox, label, scale
 
 
+class Converter(object):
+
+    def __call__(self, batch, device=None):
+        return self.cast(concat_examples(batch, device))
+
+    def cast(self, in_arrays):
+        img, bbox, label, scale = in_arrays
+        # The cast runs on the device. The mean is subtracted by the model.
+        return img.astype(np.float32), bbox, label, scale
+
+
+class _CopySlot(object):
+
+    # A pair of pinned host memory and device memory that holds all arrays
+    # of a batch. Each array starts at a 256-byte aligned offset.
+
+    def __init__(self):
+        self.host = None
+        self.device = None
+        self.event = None
+
+    def copy(self, arrays, stream):
+        offsets = list()
+        nbytes = 0
+        for array in arrays:
+            offsets.append(nbytes)
+            nbytes += (array.nbytes + 255) // 256 * 256
+
+        if self.host is None or self.host.size < nbytes:
+            # A newly allocated block can be still in use by kernels
+            # that freed it on the null stream.
+            cuda.Stream.null.synchronize()
+            mem = cuda.cupy.cuda.alloc_pinned_memory(nbytes)
+            self.host = np.frombuffer(mem, np.uint8, nbytes)
+            self.device = cuda.cupy.empty(nbytes, dtype=np.uint8)
+            self.event = None
+
+        for array, offset in zip(arrays, offsets):
+            array = np.ascontiguousarray(array)
+            self.host[offset:offset + array.nbytes] = \
+                array.reshape(-1).view(np.uint8)
+        if self.event is not None:
+            # Wait until the previous batch in this slot is consumed.
+            stream.wait_event(self.event)
+        self.device[:nbytes].set(self.host[:nbytes], stream=stream)
+
+        return tuple(
+            self.device[offset:offset + array.nbytes]
+            .view(array.dtype).reshape(array.shape)
+            for array, offset in zip(arrays, offsets))
+
+    def release(self):
+        self.event = cuda.Event()
+        self.event.record()
+
+
+class PrefetchUpdater(training.StandardUpdater):
+
+    """An updater that overlaps host-to-device copies with computation.
+
+    The next batch is copied to the device on a non-blocking stream right
+    after the kernels of the current iteration are launched. Two slots of
+    pinned host memory and device memory are used alternately.
+    Since the iterator runs one batch ahead, the epoch information of the
+    batch in use is kept separately. For the same reason, the state of the
+    iterator before the prefetched batch is taken is saved in snapshots,
+    so that the prefetched batch is not skipped when training is resumed.
+
+    Batches are concatenated by :func:`chainer.dataset.concat_examples`.
+    :obj:`cast` is applied to the arrays on the device.
+
+    """
+
+    def __init__(self, iterator, optimizer, cast, device):
+        super(PrefetchUpdater, self).__init__(
+            iterator, optimizer, device=device)
+        self._cast = cast
+        self._stream = cuda.Stream(non_blocking=True)
+        self._slots = (_CopySlot(), _CopySlot())
+        self._slot_index = 0
+        self._next = None
+        self._epoch_state = None
+
+    def _prefetch(self):
+        iterator = self._iterators['main']
+        # The values written by the serialize method of the iterator are
+        # copied. Calling the method itself resets the queue of batches
+        # already fetched by MultiprocessIterator.
+        iterator_state = {
+            'current_position': iterator.current_position,
+            'epoch': iterator.epoch,
+            'is_new_epoch': iterator.is_new_epoch,
+            'order': getattr(iterator, '_order', None),
+            'previous_epoch_detail': getattr(
+                iterator, '_previous_epoch_detail', None),
+        }
+        batch = iterator.next()
+        epoch_state = {
+            'epoch': iterator.epoch,
+            'epoch_detail': iterator.epoch_detail,
+            'previous_epoch_detail': getattr(
+                iterator, 'previous_epoch_detail', None),
+            'is_new_epoch': iterator.is_new_epoch,
+        }
+        slot = self._slots[self._slot_index]
+        self._slot_index = 1 - self._slot_index
+        with cuda.get_device_from_id(self.device):
+            in_arrays = slot.copy(concat_examples(batch), self._stream)
+        return in_arrays, slot, epoch_state, iterator_state
+
+    def _get_epoch_state(self, key):
+        if self._epoch_state is None:
+            return getattr(self._iterators['main'], key)
+        return self._epoch_state[key]
+
+    @property
+    def epoch(self):
+        return self._get_epoch_state('epoch')
+
+    @property
+    def epoch_detail(self):
+        return self._get_epoch_state('epoch_detail')
+
+    @property
+    def previous_epoch_detail(self):
+        return self._get_epoch_state('previous_epoch_detail')
+
+    @property
+    def is_new_epoch(self):
+        return self._get_epoch_state('is_new_epoch')
+
+    def update_core(self):
+        if self._next is None:
+            self._next = self._prefetch()
+        in_arrays, slot, self._epoch_state, _ = self._next
+        self._stream.synchronize()
+        in_arrays = self._cast(in_arrays)
+
+        optimizer = self._optimizers['main']
+        loss_func = self.loss_func or optimizer.target
+        optimizer.update(loss_func, *in_arrays)
+        # The slot is reused only after the kernels reading the arrays in
+        # it are finished.
+        slot.release()
+
+        self._next = self._prefetch()
+
+    def serialize(self, serializer):
+        if isinstance(serializer, chainer.serializer.Deserializer) or \
+                self._next is None:
+            super(PrefetchUpdater, self).serialize(serializer)
+            # A batch prefetched before loading is discarded.
+            self._next = None
+            self._epoch_state = None
+            return
+
+        iterator_serializer = serializer['iterator:main']
+        for key, value in self._next[3].items():
+            if value is not None:
+                iterator_serializer(key, value)
+        optimizer = self._optimizers['main']
+        optimizer.serialize(serializer['optimizer:main'])
+        optimizer.target.serialize(serializer['model:main'])
+        serializer('iteration', self.iteration)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='ChainerCV training example: Faster R-CNN')
@@ -93,14 +311,26 @@ def main():
     optimizer.setup(model)
     optimizer.add_hook(chainer.optimizer.WeightDecay(rate=0.0005))
 
-    train_data = TransformDataset(train_data, Transform(faster_rcnn))
+    train_data = TransformDataset(
+        train_data, Transform(
+            faster_rcnn.min_size, faster_rcnn.max_size, args.seed))
 
+    # MultiprocessIterator copies examples into a shared memory buffer
+    # that is allocated once and reused for every batch.
+    # A resized uint8 image fits in 3 * min_size * max_size bytes and
+    # the rest of the buffer is left for bbox and label.
+    shared_mem = 3 * faster_rcnn.min_size * faster_rcnn.max_size + 100000
     train_iter = chainer.iterators.MultiprocessIterator(
-        train_data, batch_size=1, n_processes=None, shared_mem=100000000)
+        train_data, batch_size=1, n_processes=None, shared_mem=shared_mem)
     test_iter = chainer.iterators.SerialIterator(
         test_data, batch_size=1, repeat=False, shuffle=False)
-    updater = chainer.training.updater.StandardUpdater(
-        train_iter, optimizer, device=args.gpu)
+    if args.gpu >= 0:
+        updater = PrefetchUpdater(
+            train_iter, optimizer, cast=Converter().cast, device=args.gpu)
+    else:
+        updater = chainer.training.updater.StandardUpdater(
+            train_iter, optimizer, converter=Converter(),
+            device=args.gpu)
 
     trainer = training.Trainer(
         updater, (args.iteration, 'iteration'), out=args.out)
@@ -27,19 +27,20 @@ from chainercv.links.model.ssd import resize_with_random_interpolation
 class ConcatenatedDataset(chainer.dataset.DatasetMixin):
 
     def __init__(self, *datasets):
-        self._datasets = datasets
+        self._datasets = tuple(datasets)
+        # The k-th element is the index where the k-th dataset starts.
+        # The last element is the total length, which is 0 without datasets.
+        self._offsets = np.cumsum(
+            [0] + [len(dataset) for dataset in datasets], dtype=np.int64)
 
     def __len__(self):
-        return sum(len(dataset) for dataset in self._datasets)
+        return int(self._offsets[-1])
 
     def get_example(self, i):
-        if i < 0:
+        if i < 0 or i >= self._offsets[-1]:
             raise IndexError
-        for dataset in self._datasets:
-            if i < len(dataset):
-                return dataset[i]
-            i -= len(dataset)
-        raise IndexError
+        k = int(np.searchsorted(self._offsets, i, side='right')) - 1
+        return self._datasets[k][i - int(self._offsets[k])]
 
 
 class MultiboxTrainChain(chainer.Chain):
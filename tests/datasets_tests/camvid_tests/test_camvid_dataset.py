@@ -1,3 +1,8 @@
+import mock
+import numpy as np
+import os
+import shutil
+import tempfile
 import unittest
 
 from chainer import testing
@@ -6,6 +11,8 @@ from chainer.testing import attr
 from chainercv.datasets import camvid_label_names
 from chainercv.datasets import CamVidDataset
 from chainercv.utils import assert_is_semantic_segmentation_dataset
+from chainercv.utils import read_image
+from chainercv.utils import write_image
 
 
 @testing.parameterize(
@@ -24,4 +31,80 @@ class TestCamVidDataset(unittest.TestCase):
             self.dataset, len(camvid_label_names), n_example=10)
 
 
+def _setup_dummy_data(data_dir, split, sizes):
+    os.makedirs(os.path.join(data_dir, split))
+    os.makedirs(os.path.join(data_dir, split + 'annot'))
+    paths = list()
+    with open(os.path.join(data_dir, '{}.txt'.format(split)), 'w') as f:
+        for i, size in enumerate(sizes):
+            img_fn = '{}/{}.png'.format(split, i)
+            label_fn = '{}annot/{}.png'.format(split, i)
+            write_image(
+                np.random.randint(0, 255, size=(3,) + size).astype(np.uint8),
+                os.path.join(data_dir, img_fn))
+            # Label id 11 is for unlabeled pixels.
+            write_image(
+                np.random.randint(0, 12, size=(1,) + size).astype(np.uint8),
+                os.path.join(data_dir, label_fn))
+            f.write('/SegNet/CamVid/{} /SegNet/CamVid/{}\n'.format(
+                img_fn, label_fn))
+            paths.append((os.path.join(data_dir, img_fn),
+                          os.path.join(data_dir, label_fn)))
+    return paths
+
+
+class TestCamVidDatasetCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_cache(self):
+        paths = _setup_dummy_data(self.tmp_dir, 'train', [(48, 32)] * 3)
+        dataset = CamVidDataset(self.tmp_dir, split='train')
+
+        self.assertTrue(
+            os.path.exists(os.path.join(self.tmp_dir, 'train.npy')))
+        self.assertEqual(len(dataset), 3)
+        for i, (img_path, label_path) in enumerate(paths):
+            img, label = dataset[i]
+            self.assertEqual(img.dtype, np.float32)
+            self.assertEqual(label.dtype, np.int32)
+            np.testing.assert_equal(img, read_image(img_path))
+
+            expected = read_image(
+                label_path, dtype=np.int32, color=False)[0]
+            self.assertTrue(np.any(expected == 11))
+            expected[expected == 11] = -1
+            np.testing.assert_equal(label, expected)
+
+    def test_read_only_data_dir(self):
+        paths = _setup_dummy_data(self.tmp_dir, 'train', [(48, 32)] * 3)
+        with mock.patch('os.access', return_value=False):
+            dataset = CamVidDataset(self.tmp_dir, split='train')
+
+        self.assertFalse(
+            os.path.exists(os.path.join(self.tmp_dir, 'train.npy')))
+        self.assertEqual(len(dataset), 3)
+        for i, (img_path, label_path) in enumerate(paths):
+            img, label = dataset[i]
+            np.testing.assert_equal(img, read_image(img_path))
+
+            expected = read_image(
+                label_path, dtype=np.int32, color=False)[0]
+            expected[expected == 11] = -1
+            np.testing.assert_equal(label, expected)
+
+    def test_cache_different_sizes(self):
+        _setup_dummy_data(self.tmp_dir, 'train', [(48, 32), (32, 48)])
+        with self.assertRaises(ValueError):
+            CamVidDataset(self.tmp_dir, split='train')
+        self.assertFalse(
+            os.path.exists(os.path.join(self.tmp_dir, 'train.npy')))
+        for fn in os.listdir(self.tmp_dir):
+            self.assertFalse(fn.endswith('.tmp'))
+
+
 testing.run_module(__name__, __file__)
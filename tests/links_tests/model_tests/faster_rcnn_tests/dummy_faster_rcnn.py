@@ -30,8 +30,10 @@ class DummyHead(chainer.Chain):
         super(DummyHead, self).__init__()
         self.n_class = n_class
 
-    def __call__(self, x, rois, roi_indices):
-        n_roi = len(rois)
+    def __call__(self, x, indices_and_rois):
+        # The input is kept so that tests can check it.
+        self.indices_and_rois = indices_and_rois
+        n_roi = len(indices_and_rois)
         cls_locs = chainer.Variable(
             _random_array(self.xp, (n_roi, self.n_class * 4)))
         # For each bbox, the score for a selected class is
@@ -5,9 +5,13 @@ import chainer
 from chainer import testing
 from chainer.testing import attr
 
+from chainercv.links.model.faster_rcnn import FasterRCNN
 from chainercv.utils import assert_is_detection_link
 
+from dummy_faster_rcnn import DummyExtractor
 from dummy_faster_rcnn import DummyFasterRCNN
+from dummy_faster_rcnn import DummyHead
+from dummy_faster_rcnn import DummyRegionProposalNetwork
 
 
 def _random_array(xp, shape):
@@ -34,6 +38,7 @@ class TestFasterRCNN(unittest.TestCase):
 
     def check_call(self):
         xp = self.link.xp
+        self.assertIsInstance(self.link.mean, xp.ndarray)
 
         x1 = chainer.Variable(_random_array(xp, (1, 3, 600, 800)))
         roi_cls_locs, roi_scores, rois, roi_indices = self.link(x1)
@@ -52,6 +57,13 @@ class TestFasterRCNN(unittest.TestCase):
         self.assertIsInstance(roi_indices, xp.ndarray)
         self.assertEqual(roi_indices.shape, (self.n_roi,))
 
+        # The head receives the batch indices and the RoIs in (x, y) order.
+        np.testing.assert_equal(
+            chainer.cuda.to_cpu(self.link.head.indices_and_rois),
+            np.concatenate(
+                (chainer.cuda.to_cpu(roi_indices)[:, None],
+                 chainer.cuda.to_cpu(rois)), axis=1)[:, [0, 2, 1, 4, 3]])
+
     def test_call_cpu(self):
         self.check_call()
 
@@ -106,4 +118,35 @@ class TestFasterRCNNPrepare(unittest.TestCase):
         self.check_prepare()
 
 
+class TestFasterRCNNMean(unittest.TestCase):
+
+    def _create_link(self, mean):
+        return FasterRCNN(
+            DummyExtractor(16), DummyRegionProposalNetwork(1, 1),
+            DummyHead(2), mean=mean)
+
+    def check_subtract_mean(self, link):
+        xp = link.xp
+        x = _random_array(xp, (2, 3, 32, 48))
+        y = link._subtract_mean(chainer.Variable(x))
+        np.testing.assert_almost_equal(
+            chainer.cuda.to_cpu(y.data),
+            chainer.cuda.to_cpu(x - link.mean[None]))
+
+    def test_subtract_mean_cpu(self):
+        link = self._create_link(np.array([[[100]], [[122.5]], [[145]]]))
+        self.check_subtract_mean(link)
+
+    @attr.gpu
+    def test_subtract_mean_gpu(self):
+        link = self._create_link(np.array([[[100]], [[122.5]], [[145]]]))
+        link.to_gpu()
+        self.check_subtract_mean(link)
+
+    def test_invalid_mean(self):
+        for mean in (100, np.zeros(3), np.zeros((3, 32, 48))):
+            with self.assertRaises(ValueError):
+                self._create_link(mean)
+
+
 testing.run_module(__name__, __file__)
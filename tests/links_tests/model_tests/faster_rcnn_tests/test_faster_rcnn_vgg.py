@@ -6,7 +6,9 @@ from chainer import testing
 from chainer.testing import attr
 
 from chainercv.links import FasterRCNNVGG16
+from chainercv.links import VGG16
 from chainercv.links.model.faster_rcnn import FasterRCNNTrainChain
+from chainercv.links.model.faster_rcnn import VGG16RoIHead
 from chainercv.utils import generate_random_bbox
 
 
@@ -112,4 +114,66 @@ class TestFasterRCNNVGG16Loss(unittest.TestCase):
         self.check_call()
 
 
+@attr.slow
+class TestFasterRCNNVGG16ImageNetInit(unittest.TestCase):
+
+    def test_imagenet_init(self):
+        link = FasterRCNNVGG16(n_fg_class=20, pretrained_model='imagenet')
+        vgg16 = VGG16(pretrained_model='imagenet')
+
+        layers = [(getattr(link.extractor, name), getattr(vgg16, name))
+                  for name in (
+                      'conv1_1', 'conv1_2', 'conv2_1', 'conv2_2',
+                      'conv3_1', 'conv3_2', 'conv3_3',
+                      'conv4_1', 'conv4_2', 'conv4_3',
+                      'conv5_1', 'conv5_2', 'conv5_3')]
+        layers += [(link.head.fc6, vgg16.fc6), (link.head.fc7, vgg16.fc7)]
+        for layer, vgg16_layer in layers:
+            np.testing.assert_equal(layer.W.data, vgg16_layer.W.data)
+            np.testing.assert_equal(layer.b.data, vgg16_layer.b.data)
+
+
+@attr.slow
+class TestVGG16RoIHeadCompress(unittest.TestCase):
+
+    n_class = 21
+    n_roi = 8
+
+    def setUp(self):
+        self.link = VGG16RoIHead(
+            self.n_class, roi_size=7, spatial_scale=1. / 16,
+            vgg_initialW=chainer.initializers.Normal(0.01))
+        self.x = np.random.uniform(
+            size=(1, 512, 12, 16)).astype(np.float32)
+        self.indices_and_rois = np.zeros((self.n_roi, 5), dtype=np.float32)
+        self.indices_and_rois[:, 1:3] = np.random.uniform(
+            0, 96, size=(self.n_roi, 2))
+        self.indices_and_rois[:, 3:] = self.indices_and_rois[:, 1:3] + 64
+
+    def check_compress(self):
+        roi_cls_locs, roi_scores = self.link(
+            self.link.xp.asarray(self.x),
+            self.link.xp.asarray(self.indices_and_rois))
+        # Keeping all singular values does not change the outputs.
+        self.link.compress(fc6_rank=4096, fc7_rank=4096)
+        compressed_roi_cls_locs, compressed_roi_scores = self.link(
+            self.link.xp.asarray(self.x),
+            self.link.xp.asarray(self.indices_and_rois))
+
+        np.testing.assert_allclose(
+            chainer.cuda.to_cpu(compressed_roi_cls_locs.data),
+            chainer.cuda.to_cpu(roi_cls_locs.data), atol=1e-4)
+        np.testing.assert_allclose(
+            chainer.cuda.to_cpu(compressed_roi_scores.data),
+            chainer.cuda.to_cpu(roi_scores.data), atol=1e-4)
+
+    def test_compress_cpu(self):
+        self.check_compress()
+
+    @attr.gpu
+    def test_compress_gpu(self):
+        self.link.to_gpu()
+        self.check_compress()
+
+
 testing.run_module(__name__, __file__)
@@ -1,4 +1,7 @@
+import mock
 import numpy as np
+import os
+from PIL import Image
 import tempfile
 import unittest
 
@@ -7,16 +10,26 @@ from chainer import testing
 from chainercv.utils import read_image
 from chainercv.utils import write_image
 
+try:
+    import cv2  # NOQA
+    optional_modules = True
+except ImportError:
+    optional_modules = False
+
 
 @testing.parameterize(*testing.product({
     'size': [(48, 32)],
     'color': [True, False],
     'suffix': ['bmp', 'jpg', 'png'],
     'dtype': [np.float32, np.uint8, bool],
+    'backend': ['pil', 'opencv'],
 }))
 class TestReadImage(unittest.TestCase):
 
     def setUp(self):
+        if self.backend == 'opencv' and not optional_modules:
+            self.skipTest('cv2 is not installed')
+
         self.file = tempfile.NamedTemporaryFile(
             suffix='.' + self.suffix, delete=False)
         self.path = self.file.name
@@ -29,6 +42,13 @@ class TestReadImage(unittest.TestCase):
                 0, 255, size=(1,) + self.size, dtype=np.uint8)
         write_image(self.img, self.path)
 
+        self.patch = mock.patch.dict(
+            os.environ, {'CHAINERCV_IMAGE_BACKEND': self.backend})
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+
     def test_read_image_as_color(self):
         if self.dtype == np.float32:
             img = read_image(self.path)
@@ -61,4 +81,41 @@ class TestReadImage(unittest.TestCase):
         np.testing.assert_equal(img, 0)
 
 
+# An EXIF segment whose orientation tag (0x0112) is 6, which means that
+# the image should be rotated by 90 degrees to be displayed.
+_exif_rotated = (
+    b'Exif\x00\x00MM\x00\x2a\x00\x00\x00\x08\x00\x01'
+    b'\x01\x12\x00\x03\x00\x00\x00\x01\x00\x06\x00\x00'
+    b'\x00\x00\x00\x00')
+
+
+@testing.parameterize(
+    {'backend': 'pil'},
+    {'backend': 'opencv'},
+)
+class TestReadImageEXIFOrientation(unittest.TestCase):
+
+    def setUp(self):
+        if self.backend == 'opencv' and not optional_modules:
+            self.skipTest('cv2 is not installed')
+
+        self.file = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
+        self.path = self.file.name
+
+        self.img = np.random.randint(
+            0, 255, size=(48, 32, 3), dtype=np.uint8)
+        Image.fromarray(self.img).save(self.path, exif=_exif_rotated)
+
+        self.patch = mock.patch.dict(
+            os.environ, {'CHAINERCV_IMAGE_BACKEND': self.backend})
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+
+    def test_read_image_ignore_orientation(self):
+        img = read_image(self.path)
+        self.assertEqual(img.shape, (3, 48, 32))
+
+
 testing.run_module(__name__, __file__)